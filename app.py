@@ -1,6 +1,6 @@
 import os
 from flask import Flask
-from init import db, ma, bcrypt, jwt
+from init import db, ma, bcrypt, jwt, query_budget
 from controllers.cli_controllers import db_commands
 from controllers.auth_controller import auth_bp
 from controllers.main_controllers import main_bp  # Import the main controller
@@ -18,11 +18,13 @@ def create_app():
     app = Flask(__name__)
     app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL")  # Set your database URL
     app.config["JWT_SECRET_KEY"] = os.environ.get("JWT_SECRET_KEY")  # Set your JWT secret key
+    app.config["SLOT_HOLD_SECONDS"] = int(os.environ.get("SLOT_HOLD_SECONDS", 300))  # Lifetime of a slot hold
 
     db.init_app(app)
     ma.init_app(app)
     bcrypt.init_app(app)
     jwt.init_app(app)
+    query_budget.init_app(app)
 
     app.register_blueprint(db_commands)
     app.register_blueprint(auth_bp)
@@ -1,6 +1,6 @@
 from flask import Blueprint, request
 from models.user import User, user_schema
-from init import bcrypt, db
+from init import bcrypt, db, query_budget
 from sqlalchemy.exc import IntegrityError
 from psycopg2 import errorcodes
 from flask_jwt_extended import create_access_token
@@ -9,6 +9,7 @@ from datetime import timedelta
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
 @auth_bp.route("/register", methods=["POST"])
+@query_budget.limit(statements=2, ms=100)
 def register_user():
     """
     Register a new user.
@@ -66,6 +67,7 @@ def register_user():
 
 
 @auth_bp.route("/login", methods=["POST"])
+@query_budget.limit(statements=1, ms=100)
 def login_user():
     """
     Log in an existing user.
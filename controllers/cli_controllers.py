@@ -1,6 +1,20 @@
-from flask import Blueprint
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from itertools import islice, repeat
+from types import SimpleNamespace
+
+import click
+from flask import Blueprint, current_app
+from flask_bcrypt import Bcrypt
+from marshmallow import EXCLUDE, ValidationError, fields, validate
+from sqlalchemy import or_
+from sqlalchemy.exc import DBAPIError
 from init import db, bcrypt
-from models.user import User
+from models.user import User, UserSchema
+from models.booking import Booking, BookingSchema
 from models.employee import Employee
 from models.service import Service
 from models.available_date import AvailableDate
@@ -93,4 +107,414 @@ def drop_tables():
         None
     """
     db.drop_all()  # Drop all tables from the database
-    print("Tables dropped.")  # Print confirmation message
\ No newline at end of file
+    print("Tables dropped.")  # Print confirmation message
+
+# Schemas used to validate imported rows (passwords are loaded, is_admin is never imported)
+# Largest value a BigInteger column can hold
+MAX_BIGINT = 2 ** 63 - 1
+
+# App settings that change how Flask-Bcrypt hashes passwords
+BCRYPT_SETTINGS = ("BCRYPT_LOG_ROUNDS", "BCRYPT_HASH_PREFIX", "BCRYPT_HANDLE_LONG_PASSWORDS")
+
+
+class UserImportSchema(UserSchema):
+    """
+    User schema with typed fields for validating imported rows.
+
+    UserSchema only lists field names, so it checks nothing on load. These
+    fields match the column types and limits of the users table.
+    """
+    name = fields.String(validate=validate.Length(max=User.name.type.length))
+    email = fields.Email(required=True)
+    mobile_number = fields.Integer(required=True, validate=validate.Range(min=1, max=MAX_BIGINT))
+    password = fields.String(required=True, validate=validate.Length(min=1))
+
+
+class BookingImportSchema(BookingSchema):
+    """
+    Booking schema with the reference fields accepted by the import.
+
+    The user can be given either by user_id or by email.
+    """
+    user_id = fields.Integer()
+    email = fields.Email()
+    service_id = fields.Integer(required=True)
+    employee_id = fields.Integer(required=True)
+
+
+# Schemas used to validate imported rows (is_admin is never imported)
+user_import_schema = UserImportSchema(only=("name", "email", "mobile_number", "password"))
+booking_import_schema = BookingImportSchema(only=("user_id", "email", "service_id", "employee_id", "dog_breed", "dog_weight"))
+
+# Fields never copied into the error report
+REDACTED_FIELDS = ("password",)
+
+
+def _hash_password(password, settings):
+    """
+    Hash a single password. Runs inside a worker process of the import pool.
+
+    The worker builds its own Bcrypt from the app's bcrypt settings, so the
+    hash matches one made by init.bcrypt in the auth controller.
+
+    Args:
+        password (str): The plain text password.
+        settings (dict): The app's BCRYPT_* config values.
+
+    Returns:
+        str: The bcrypt hash, decoded as in the auth controller.
+    """
+    hasher = Bcrypt(SimpleNamespace(config=settings))
+    return hasher.generate_password_hash(password).decode("utf-8")
+
+
+def _read_rows(path, file_format, start_after):
+    """
+    Stream rows from a CSV or JSONL file one at a time.
+
+    Rows are numbered from 1 in file order. Rows up to and including
+    ``start_after`` are skipped without being validated, which is how an
+    import resumes from its checkpoint.
+
+    Yields:
+        tuple: (row_number, row, errors) where errors is None unless the
+        row could not be parsed.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        if file_format == "csv":
+            for row_number, row in enumerate(csv.DictReader(file), start=1):
+                if row_number <= start_after:
+                    continue
+                # Empty CSV cells are treated as missing values
+                row = {key.strip(): value.strip() for key, value in row.items()
+                       if key and value is not None and value.strip() != ""}
+                yield row_number, row, None
+        else:
+            row_number = 0
+            for line in file:
+                if not line.strip():
+                    continue
+                row_number += 1
+                if row_number <= start_after:
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as err:
+                    yield row_number, {"line": line.rstrip("\n")}, {"row": [f"Invalid JSON: {err.msg}."]}
+                    continue
+                if not isinstance(row, dict):
+                    yield row_number, {"line": line.rstrip("\n")}, {"row": ["Expected a JSON object."]}
+                    continue
+                yield row_number, row, None
+
+
+def _validate_user_row(row):
+    """
+    Validate an imported user row with the user import schema.
+
+    Returns:
+        tuple: (data, errors) where exactly one of the two is None.
+    """
+    try:
+        return user_import_schema.load(row, unknown=EXCLUDE), None
+    except ValidationError as err:
+        return None, err.messages
+
+
+def _validate_booking_row(row):
+    """
+    Validate an imported booking row.
+
+    The row mirrors the body of ``POST /bookings``, except that the user can
+    be given either by ``user_id`` or by ``email``. The fields are validated
+    with the booking import schema.
+
+    Returns:
+        tuple: (data, errors) where exactly one of the two is None.
+    """
+    try:
+        data = booking_import_schema.load(row, unknown=EXCLUDE)
+    except ValidationError as err:
+        return None, err.messages
+
+    errors = {}
+    if "user_id" not in data and "email" not in data:
+        errors["user_id"] = ["Either user_id or email is required."]
+    try:
+        data["booking_time"] = datetime.strptime(f"{row.get('date')} {row.get('time')}", "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        errors["date"] = ["Expected date as YYYY-MM-DD and time as HH:MM:SS."]
+    return (None, errors) if errors else (data, None)
+
+
+def _validate_rows(rows, validate):
+    """
+    Run each parsed row through a validator.
+
+    Yields:
+        tuple: (row_number, row, data, errors).
+    """
+    for row_number, row, errors in rows:
+        if errors:
+            yield row_number, row, None, errors
+            continue
+        data, errors = validate(row)
+        yield row_number, row, data, errors
+
+
+def _batched(items, size):
+    """
+    Group an iterable into lists of at most ``size`` items.
+    """
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _commit_rows(accepted, add_row):
+    """
+    Insert a chunk of accepted rows in a single transaction.
+
+    If the chunk fails in the database (for example a user registered through
+    the API while the import was running, or a value the column cannot hold),
+    it is rolled back and retried one row at a time so that only the
+    offending rows are reported.
+
+    Args:
+        accepted (list): (row_number, row, data) tuples.
+        add_row (callable): Adds the objects for one row's data to the session.
+
+    Returns:
+        tuple: (imported count, list of (row_number, row, errors) failures).
+    """
+    try:
+        for _, _, data in accepted:
+            add_row(data)
+        db.session.commit()
+        return len(accepted), []
+    except DBAPIError:
+        db.session.rollback()
+
+    imported, failures = 0, []
+    for row_number, row, data in accepted:
+        try:
+            add_row(data)
+            db.session.commit()
+            imported += 1
+        except DBAPIError as err:
+            db.session.rollback()
+            failures.append((row_number, row, {"row": [str(err.orig).strip()]}))
+    return imported, failures
+
+
+def _import_user_batch(batch, executor, bcrypt_settings):
+    """
+    De-duplicate, hash and insert one chunk of user rows.
+
+    Existing emails and mobile numbers are looked up with one query for the
+    whole chunk, and duplicates inside the chunk are caught as well.
+
+    Returns:
+        tuple: (imported count, list of (row_number, row, errors) failures).
+    """
+    failures = [(row_number, row, errors) for row_number, row, data, errors in batch if errors]
+    valid = [(row_number, row, data) for row_number, row, data, errors in batch if not errors]
+    if not valid:
+        return 0, failures
+
+    stmt = db.select(User.email, User.mobile_number).where(or_(
+        User.email.in_({data["email"] for _, _, data in valid}),
+        User.mobile_number.in_({data["mobile_number"] for _, _, data in valid})
+    ))
+    taken_emails, taken_mobiles = set(), set()
+    for email, mobile_number in db.session.execute(stmt):
+        taken_emails.add(email)
+        taken_mobiles.add(mobile_number)
+
+    accepted = []
+    for row_number, row, data in valid:
+        if data["email"] in taken_emails:
+            failures.append((row_number, row, {"email": ["Email address is already in use."]}))
+        elif data["mobile_number"] in taken_mobiles:
+            failures.append((row_number, row, {"mobile_number": ["Mobile number is already in use."]}))
+        else:
+            taken_emails.add(data["email"])
+            taken_mobiles.add(data["mobile_number"])
+            accepted.append((row_number, row, data))
+
+    passwords = [data["password"] for _, _, data in accepted]
+    for (_, _, data), password in zip(accepted, executor.map(_hash_password, passwords, repeat(bcrypt_settings))):
+        data["password"] = password
+
+    def add_user(data):
+        db.session.add(User(
+            name=data.get("name"),
+            email=data["email"],
+            mobile_number=data["mobile_number"],
+            password=data["password"]
+        ))
+
+    imported, commit_failures = _commit_rows(accepted, add_user)
+    return imported, failures + commit_failures
+
+
+def _import_booking_batch(batch):
+    """
+    Resolve references, check slot conflicts and insert one chunk of bookings.
+
+    Users, services, employees and the existing slots on the chunk's dates are
+    each fetched with a single query, and a booking is rejected when another
+    booked slot on the same date starts less than one hour away, as in
+    ``POST /bookings``.
+
+    Returns:
+        tuple: (imported count, list of (row_number, row, errors) failures).
+    """
+    failures = [(row_number, row, errors) for row_number, row, data, errors in batch if errors]
+    valid = [(row_number, row, data) for row_number, row, data, errors in batch if not errors]
+    if not valid:
+        return 0, failures
+
+    emails = {data["email"] for _, _, data in valid if "email" in data and "user_id" not in data}
+    user_ids = {data["user_id"] for _, _, data in valid if "user_id" in data}
+    users_by_email = dict(db.session.execute(
+        db.select(User.email, User.user_id).where(User.email.in_(emails))
+    ).all()) if emails else {}
+    known_users = set(db.session.scalars(db.select(User.user_id).where(User.user_id.in_(user_ids))))
+    known_services = set(db.session.scalars(db.select(Service.service_id).where(
+        Service.service_id.in_({data["service_id"] for _, _, data in valid}))))
+    known_employees = set(db.session.scalars(db.select(Employee.employee_id).where(
+        Employee.employee_id.in_({data["employee_id"] for _, _, data in valid}))))
+
+    slots, booked = {}, {}
+    dates = {data["booking_time"].date() for _, _, data in valid}
+    for slot in db.session.scalars(db.select(AvailableDate).where(AvailableDate.date.in_(dates))):
+        slots[(slot.date, slot.time)] = slot
+        if slot.is_booked:
+            booked.setdefault(slot.date, []).append(datetime.combine(slot.date, slot.time))
+
+    accepted = []
+    for row_number, row, data in valid:
+        if "user_id" in data:
+            user_found = data["user_id"] in known_users
+        else:
+            data["user_id"] = users_by_email.get(data["email"])
+            user_found = data["user_id"] is not None
+        booking_time = data["booking_time"]
+        if not user_found:
+            failures.append((row_number, row, {"user_id": ["User not found."]}))
+        elif data["service_id"] not in known_services:
+            failures.append((row_number, row, {"service_id": ["Service not found."]}))
+        elif data["employee_id"] not in known_employees:
+            failures.append((row_number, row, {"employee_id": ["Employee not found."]}))
+        elif any(abs(other - booking_time) < timedelta(hours=1) for other in booked.get(booking_time.date(), [])):
+            failures.append((row_number, row, {"time": ["The selected time is already booked."]}))
+        else:
+            booked.setdefault(booking_time.date(), []).append(booking_time)
+            data["slot"] = slots.get((booking_time.date(), booking_time.time()))
+            accepted.append((row_number, row, data))
+
+    def add_booking(data):
+        available_date = data["slot"]
+        if available_date is None:
+            available_date = AvailableDate(date=data["booking_time"].date(), time=data["booking_time"].time())
+            db.session.add(available_date)
+        available_date.is_booked = True
+        available_date.user_id = data["user_id"]
+        db.session.flush()  # Assigns available_date.date_id for a new slot
+        db.session.add(Booking(
+            user_id=data["user_id"],
+            date_id=available_date.date_id,
+            service_id=data["service_id"],
+            employee_id=data["employee_id"],
+            dog_breed=data.get("dog_breed"),
+            dog_weight=data.get("dog_weight")
+        ))
+
+    imported, commit_failures = _commit_rows(accepted, add_booking)
+    return imported, failures + commit_failures
+
+
+def _load_checkpoint(checkpoint_path, path, kind):
+    """
+    Return the last committed row number recorded for this file, or 0.
+    """
+    if not os.path.exists(checkpoint_path):
+        return 0
+    with open(checkpoint_path, encoding="utf-8") as file:
+        checkpoint = json.load(file)
+    if checkpoint.get("path") != os.path.abspath(path) or checkpoint.get("kind") != kind:
+        raise click.ClickException(f"Checkpoint {checkpoint_path} belongs to a different import.")
+    return checkpoint["row"]
+
+
+def _save_checkpoint(checkpoint_path, path, kind, row_number):
+    """
+    Atomically record the last committed row number.
+    """
+    temp_path = f"{checkpoint_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump({"path": os.path.abspath(path), "kind": kind, "row": row_number}, file)
+    os.replace(temp_path, checkpoint_path)
+
+
+@db_commands.cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--kind", type=click.Choice(["users", "bookings"]), required=True, help="What the file contains.")
+@click.option("--format", "file_format", type=click.Choice(["csv", "jsonl"]), help="Defaults to the file extension.")
+@click.option("--batch-size", type=click.IntRange(min=1), default=500, show_default=True, help="Rows per transaction.")
+@click.option("--workers", type=click.IntRange(min=1), help="Password hashing processes (defaults to the CPU count).")
+@click.option("--errors", "errors_path", type=click.Path(dir_okay=False), help="Defaults to PATH.errors.jsonl.")
+@click.option("--checkpoint", "checkpoint_path", type=click.Path(dir_okay=False), help="Defaults to PATH.checkpoint.")
+@click.option("--resume", is_flag=True, help="Continue after the last committed row in the checkpoint.")
+def import_data(path, kind, file_format, batch_size, workers, errors_path, checkpoint_path, resume):
+    """
+    Import users or bookings from a CSV or JSONL file.
+
+    The file is streamed through a generator pipeline so memory use does not
+    depend on its size. Each chunk of rows is validated, de-duplicated
+    against the database with one query, and inserted in one transaction.
+    User passwords are hashed in a process pool. Rejected rows are written to
+    the error report with their original values, and the checkpoint is
+    updated after every committed chunk so an interrupted import can be
+    continued with --resume.
+
+    Returns:
+        None
+    """
+    file_format = file_format or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    errors_path = errors_path or f"{path}.errors.jsonl"
+    checkpoint_path = checkpoint_path or f"{path}.checkpoint"
+
+    start_after = _load_checkpoint(checkpoint_path, path, kind) if resume else 0
+    if start_after:
+        print(f"Resuming after row {start_after}.")
+
+    validate = _validate_user_row if kind == "users" else _validate_booking_row
+    rows = _validate_rows(_read_rows(path, file_format, start_after), validate)
+
+    executor = ProcessPoolExecutor(max_workers=workers) if kind == "users" else None
+    bcrypt_settings = {key: current_app.config[key] for key in BCRYPT_SETTINGS if key in current_app.config}
+    imported = rejected = 0
+    try:
+        with open(errors_path, "a" if resume else "w", encoding="utf-8") as error_report:
+            for batch in _batched(rows, batch_size):
+                if kind == "users":
+                    batch_imported, failures = _import_user_batch(batch, executor, bcrypt_settings)
+                else:
+                    batch_imported, failures = _import_booking_batch(batch)
+
+                for row_number, row, errors in sorted(failures, key=lambda failure: failure[0]):
+                    row = {key: value for key, value in row.items() if key not in REDACTED_FIELDS}
+                    error_report.write(json.dumps({"row_number": row_number, "row": row, "errors": errors}, default=str) + "\n")
+                error_report.flush()
+                _save_checkpoint(checkpoint_path, path, kind, batch[-1][0])
+
+                imported += batch_imported
+                rejected += len(failures)
+                print(f"Committed up to row {batch[-1][0]}: {imported} imported, {rejected} rejected.")
+    finally:
+        if executor:
+            executor.shutdown()
+
+    print(f"Import finished: {imported} imported, {rejected} rejected. Errors written to {errors_path}.")
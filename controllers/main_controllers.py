@@ -1,17 +1,18 @@
-from flask import Blueprint, request, jsonify
-from datetime import datetime, timedelta 
+from flask import Blueprint, request, jsonify, current_app
+from datetime import datetime, timedelta, timezone, time as dt_time
 from models.user import User, user_schema, users_schema
 from models.booking import Booking, booking_schema, bookings_schema
 from models.available_date import AvailableDate, available_date_schema, available_dates_schema
 from models.employee import Employee, employee_schema, employees_schema
 from models.service import Service, service_schema, services_schema
-from init import db
+from init import db, hold_store, query_budget
 
 # Create a Blueprint for the main application
 main_bp = Blueprint("main", __name__)
 
 # User routes
 @main_bp.route('/users', methods=['GET'])
+@query_budget.limit(statements=1, ms=100)
 def get_users():
     """
     Retrieve all users from the database.
@@ -26,6 +27,7 @@ def get_users():
     return jsonify(users)  # Return the serialized list of users
 
 @main_bp.route('/users', methods=['POST'])
+@query_budget.limit(statements=2, ms=100)
 def add_user():
     """
     Add a new user to the database.
@@ -56,6 +58,7 @@ def add_user():
 
 # Booking routes
 @main_bp.route('/bookings', methods=['GET'])
+@query_budget.limit(statements=1, ms=100)
 def get_bookings():
     """
     Retrieve all bookings from the database.
@@ -70,6 +73,7 @@ def get_bookings():
     return jsonify(bookings)  # Return the serialized list of bookings
 
 @main_bp.route('/bookings', methods=['POST'])
+@query_budget.limit(statements=7, ms=250)
 def add_booking():
     """
     Create a new booking.
@@ -86,68 +90,107 @@ def add_booking():
         - employee_id: The ID of the employee assigned to the booking.
         - dog_breed: The breed of the dog for the booking.
         - dog_weight: The weight of the dog for the booking.
+        - hold_token: Optional token from POST /available_dates/<id>/hold. When
+          given, date_id replaces date and time and the overlap checks are skipped.
+        - date_id: The ID of the held available date (with hold_token only).
 
     Returns:
         JSON response containing the newly created booking.
         HTTP status code 201 if successful, or error messages if validation fails.
     """
     # Extract information from the request
-    user_id = request.json['user_id']
-    date = request.json['date']  # Expecting a full date string
-    time = request.json['time']   # Expecting a time string
-
-    # Convert string time to datetime object
-    booking_time = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M:%S")
-    end_time = booking_time + timedelta(hours=1)  # End time is one hour later
-
-    # Check for overlapping bookings
-    overlapping_booking = AvailableDate.query.filter(
-        AvailableDate.date == date,
-        AvailableDate.is_booked == True,
-        (AvailableDate.time >= booking_time.time()) &
-        (AvailableDate.time < end_time.time())
-    ).first()  # Fetch first overlapping booking if exists
-
-    if overlapping_booking:
-        return jsonify({"error": "The selected time is already booked."}), 400  # Return error if time is booked
-
-    # Check for last booking that ends within one hour before the requested time
-    last_booking_check = AvailableDate.query.filter(
-        AvailableDate.date == date,
-        AvailableDate.is_booked == True,
-        (AvailableDate.time + timedelta(hours=1) > booking_time.time())  # Last booking overlaps with requested time
-    ).first()  # Fetch first last booking if exists
-
-    if last_booking_check:
-        return jsonify({"error": "The selected time is less than one hour after the last booking."}), 400  # Return error if too close to last booking
-
-    # If no overlapping booking exists, create or update the available date
-    available_date = AvailableDate.query.filter_by(date=date, time=booking_time.time()).first()  # Check if available date exists
-
-    if not available_date:
-        # If it doesn't exist, create a new available date
-        available_date = AvailableDate(
-            date=date,
-            time=booking_time.time(),
-            is_booked=True,
-            user_id=user_id  # Set the user_id
-        )
-        db.session.add(available_date)  # Add the new available date to the session
-        db.session.commit()  # Commit to get the available_date.date_id for the booking
+    user_id = int(request.json['user_id'])
+    hold_token = request.json.get('hold_token')
+    booking_details = {
+        "service_id": request.json['service_id'],
+        "employee_id": request.json['employee_id'],
+        "dog_breed": request.json['dog_breed'],
+        "dog_weight": request.json['dog_weight']
+    }
+
+    if hold_token:
+        # Convert a hold into a booking. The overlap checks were done when the
+        # hold was taken, and overlapping slots cannot be held or booked while it lasts.
+        date_id = int(request.json['date_id'])
+        hold = hold_store.claim(date_id, hold_token, user_id)
+        if not hold:
+            return jsonify({"error": "The hold has expired or is not valid."}), 409  # Return error if the hold is gone
+
+        # Lock the held row, since the hold store cannot see bookings made by the import or other processes
+        available_date = db.session.get(AvailableDate, date_id, with_for_update=True)
+        if not available_date or available_date.is_booked:
+            db.session.rollback()
+            return jsonify({"error": "The selected time is no longer available."}), 409  # Return error if the slot was booked elsewhere
+
+        try:
+            available_date.is_booked = True  # Mark as booked
+            available_date.user_id = user_id  # Update user_id
+            new_booking = Booking(user_id=user_id, date_id=date_id, **booking_details)
+            db.session.add(new_booking)  # Add the new booking to the session
+            db.session.commit()  # Commit the booked date and the new booking together
+        except Exception:
+            db.session.rollback()
+            hold_store.restore(date_id, hold)  # Give the customer their hold back if the booking fails
+            raise
+
+        return booking_schema.dump(new_booking), 201  # Return the serialized booking data with a 201 status
     else:
-        # If it exists and is not booked, just update the user_id
-        available_date.is_booked = True  # Mark as booked
-        available_date.user_id = user_id  # Update user_id
-        db.session.commit()  # Commit the changes
+        date = request.json['date']  # Expecting a full date string
+        time = request.json['time']   # Expecting a time string
+
+        # Convert string time to datetime object
+        booking_time = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M:%S")
+        end_time = booking_time + timedelta(hours=1)  # End time is one hour later
+
+        # Check for overlapping bookings
+        overlapping_booking = AvailableDate.query.filter(
+            AvailableDate.date == date,
+            AvailableDate.is_booked == True,
+            (AvailableDate.time >= booking_time.time()) &
+            (AvailableDate.time < end_time.time())
+        ).first()  # Fetch first overlapping booking if exists
+
+        if overlapping_booking:
+            return jsonify({"error": "The selected time is already booked."}), 400  # Return error if time is booked
+
+        # Check for last booking that ends within one hour before the requested time
+        last_booking_check = AvailableDate.query.filter(
+            AvailableDate.date == date,
+            AvailableDate.is_booked == True,
+            (AvailableDate.time + timedelta(hours=1) > booking_time.time())  # Last booking overlaps with requested time
+        ).first()  # Fetch first last booking if exists
+
+        if last_booking_check:
+            return jsonify({"error": "The selected time is less than one hour after the last booking."}), 400  # Return error if too close to last booking
+
+        # Check for slots held by other customers
+        if hold_store.conflicts(booking_time):
+            return jsonify({"error": "The selected time is currently held by another customer."}), 409  # Return error if time is held
+
+        # If no overlapping booking exists, create or update the available date
+        available_date = AvailableDate.query.filter_by(date=date, time=booking_time.time()).first()  # Check if available date exists
+
+        if not available_date:
+            # If it doesn't exist, create a new available date
+            available_date = AvailableDate(
+                date=date,
+                time=booking_time.time(),
+                is_booked=True,
+                user_id=user_id  # Set the user_id
+            )
+            db.session.add(available_date)  # Add the new available date to the session
+            db.session.commit()  # Commit to get the available_date.date_id for the booking
+        else:
+            # If it exists and is not booked, just update the user_id
+            available_date.is_booked = True  # Mark as booked
+            available_date.user_id = user_id  # Update user_id
+            db.session.commit()  # Commit the changes
 
     # Create the new booking
     new_booking = Booking(
         user_id=user_id,
         date_id=available_date.date_id,  # Use date_id here
-        service_id=request.json['service_id'],
-        employee_id=request.json['employee_id'],
-        dog_breed=request.json['dog_breed'],
-        dog_weight=request.json['dog_weight']
+        **booking_details
     )
 
     db.session.add(new_booking)  # Add the new booking to the session
@@ -157,20 +200,81 @@ def add_booking():
 
 # Available Dates routes
 @main_bp.route('/available_dates', methods=['GET'])
+@query_budget.limit(statements=1, ms=100)
 def get_available_dates():
     """
     Retrieve all available dates from the database.
 
     This endpoint responds to GET requests and returns a list of all
-    available dates in JSON format. The dates are serialized using the available_dates_schema.
+    available dates in JSON format, leaving out dates currently held by a
+    customer. The dates are serialized using the available_dates_schema.
 
     Returns:
         JSON response containing a list of available dates.
     """
-    dates = available_dates_schema.dump(AvailableDate.query.all())  # Query all AvailableDate records from the database
+    query = AvailableDate.query
+    held_ids = hold_store.held_ids()
+    if held_ids:
+        query = query.filter(AvailableDate.date_id.not_in(held_ids))  # Hide held dates from the listing
+    dates = available_dates_schema.dump(query.all())  # Query the AvailableDate records from the database
     return jsonify(dates)  # Return the serialized list of available dates
 
+@main_bp.route('/available_dates/<int:date_id>/hold', methods=['POST'])
+@query_budget.limit(statements=2, ms=100)
+def hold_available_date(date_id):
+    """
+    Place a short-lived hold on an available date.
+
+    This endpoint responds to POST requests and reserves the available date
+    for one customer while they fill in the booking details. The date is
+    hidden from GET /available_dates until the hold expires or is converted
+    into a booking with POST /bookings.
+
+    Request Body:
+        - user_id: The ID of the user taking the hold.
+
+    Returns:
+        JSON response containing the hold token and its expiry time.
+        HTTP status code 201 if successful, or error messages if the date cannot be held.
+    """
+    user_id = int(request.json['user_id'])
+
+    available_date = db.session.get(AvailableDate, date_id)  # Fetch the available date by primary key
+    if not available_date:
+        return jsonify({"error": f"Available date with id {date_id} not found."}), 404  # Return error if it doesn't exist
+
+    if available_date.is_booked:
+        return jsonify({"error": "The selected time is already booked."}), 400  # Return error if time is booked
+
+    # Check for bookings starting less than one hour before or after the slot
+    starts_at = datetime.combine(available_date.date, available_date.time)
+    window_start = starts_at - timedelta(hours=1)
+    window_end = starts_at + timedelta(hours=1)
+    overlapping_booking = AvailableDate.query.filter(
+        AvailableDate.date == available_date.date,
+        AvailableDate.is_booked == True,
+        # Clamp the window to the slot's day so it never wraps past midnight
+        AvailableDate.time > window_start.time() if window_start.date() == starts_at.date() else AvailableDate.time >= dt_time.min,
+        AvailableDate.time < window_end.time() if window_end.date() == starts_at.date() else AvailableDate.time <= dt_time.max
+    ).first()  # Fetch first overlapping booking if exists
+
+    if overlapping_booking:
+        return jsonify({"error": "The selected time is less than one hour from another booking."}), 400  # Return error if too close to a booking
+
+    hold = hold_store.hold(date_id, user_id, starts_at, current_app.config["SLOT_HOLD_SECONDS"])
+    if not hold:
+        return jsonify({"error": "The selected time is currently held by another customer."}), 409  # Return error if time is held
+
+    hold_token, expires_at = hold
+    return jsonify({
+        "date_id": date_id,
+        "user_id": user_id,
+        "hold_token": hold_token,
+        "expires_at": datetime.fromtimestamp(expires_at, timezone.utc).isoformat()
+    }), 201  # Return the hold token with a 201 status
+
 @main_bp.route('/available_dates', methods=['POST'])
+@query_budget.limit(statements=2, ms=100)
 def add_available_date():
     """
     Add a new available date to the database.
@@ -188,9 +292,11 @@ def add_available_date():
         JSON response containing the newly created available date.
         HTTP status code 201 if successful.
     """
+    # Convert the date and time strings as add_booking does, rather than relying on the database to parse them
+    slot_time = datetime.strptime(f"{request.json['date']} {request.json['time']}", "%Y-%m-%d %H:%M:%S")
     new_date = AvailableDate(
-        date=request.json['date'],
-        time=request.json['time'],
+        date=slot_time.date(),
+        time=slot_time.time(),
         is_booked=request.json.get('is_booked', False)
     )
     db.session.add(new_date)  # Add the new available date to the session
@@ -199,6 +305,7 @@ def add_available_date():
 
 # Employee routes
 @main_bp.route('/employees', methods=['GET'])
+@query_budget.limit(statements=1, ms=100)
 def get_employees():
     """
     Retrieve all employees from the database.
@@ -213,6 +320,7 @@ def get_employees():
     return jsonify(employees)  # Return the serialized list of employees
 
 @main_bp.route('/employees', methods=['POST'])
+@query_budget.limit(statements=2, ms=100)
 def add_employee():
     """
     Add a new employee to the database.
@@ -237,6 +345,7 @@ def add_employee():
 
 # Service routes
 @main_bp.route('/services', methods=['GET'])
+@query_budget.limit(statements=1, ms=100)
 def get_services():
     """
     Retrieve all services from the database.
@@ -251,6 +360,7 @@ def get_services():
     return jsonify(services)  # Return the serialized list of services
 
 @main_bp.route('/services', methods=['POST'])
+@query_budget.limit(statements=2, ms=100)
 def add_service():
     """
     Add a new service to the database.
@@ -0,0 +1,132 @@
+import heapq
+import secrets
+import threading
+import time
+from datetime import timedelta
+
+
+class HoldStore:
+    """
+    In-process store of short-lived holds on available dates.
+
+    Each held slot maps to a single compact tuple, and expiry is driven by a
+    min-heap ordered by expiry time, so expired holds are reclaimed by popping
+    the heap rather than scanning every hold or the available_dates table.
+    Heap entries left behind by released or claimed holds are skipped when
+    popped and dropped when the heap is compacted.
+
+    Attributes:
+        _holds (dict): date_id -> (token, user_id, starts_at, expires_at).
+        _by_date (dict): date -> set of held date_ids, used for overlap checks.
+        _heap (list): (expires_at, date_id, token) entries.
+    """
+
+    def __init__(self):
+        self._holds = {}
+        self._by_date = {}
+        self._heap = []
+        self._lock = threading.Lock()
+
+    def _reclaim(self, now):
+        """Drop every hold whose expiry time has passed."""
+        while self._heap and self._heap[0][0] <= now:
+            _, date_id, token = heapq.heappop(self._heap)
+            hold = self._holds.get(date_id)
+            if hold and hold[0] == token:
+                self._remove(date_id)
+
+    def _remove(self, date_id):
+        """Remove a hold and its date index entry."""
+        _, _, starts_at, _ = self._holds.pop(date_id)
+        held = self._by_date[starts_at.date()]
+        held.discard(date_id)
+        if not held:
+            del self._by_date[starts_at.date()]
+        # Compact once stale entries outnumber live holds
+        if len(self._heap) > 2 * len(self._holds) + 64:
+            self._heap = [(expires_at, held_id, token)
+                          for held_id, (token, _, _, expires_at) in self._holds.items()]
+            heapq.heapify(self._heap)
+
+    def conflicts(self, starts_at):
+        """
+        Check whether an active hold starts less than one hour from starts_at.
+
+        Args:
+            starts_at (datetime): Start of the slot being checked.
+
+        Returns:
+            bool: True if a conflicting hold exists.
+        """
+        with self._lock:
+            self._reclaim(time.time())
+            return self._conflicts(starts_at)
+
+    def _conflicts(self, starts_at):
+        for date_id in self._by_date.get(starts_at.date(), ()):
+            if abs(self._holds[date_id][2] - starts_at) < timedelta(hours=1):
+                return True
+        return False
+
+    def hold(self, date_id, user_id, starts_at, ttl):
+        """
+        Take a hold on an available date.
+
+        Args:
+            date_id (int): The available date to hold.
+            user_id (int): The user taking the hold.
+            starts_at (datetime): Start of the slot, used for overlap checks.
+            ttl (int): Lifetime of the hold in seconds.
+
+        Returns:
+            tuple: (token, expires_at) if the hold was taken, or None if the
+            slot or an overlapping slot is already held.
+        """
+        with self._lock:
+            now = time.time()
+            self._reclaim(now)
+            if date_id in self._holds or self._conflicts(starts_at):
+                return None
+            token = secrets.token_hex(8)
+            expires_at = now + ttl
+            self._holds[date_id] = (token, user_id, starts_at, expires_at)
+            self._by_date.setdefault(starts_at.date(), set()).add(date_id)
+            heapq.heappush(self._heap, (expires_at, date_id, token))
+            return token, expires_at
+
+    def claim(self, date_id, token, user_id):
+        """
+        Remove a hold so it can be converted into a booking.
+
+        Returns:
+            tuple: The removed hold, to pass to restore if the booking fails,
+            or None if the token does not match an active hold taken by user_id.
+        """
+        with self._lock:
+            self._reclaim(time.time())
+            hold = self._holds.get(date_id)
+            if not hold or hold[0] != token or hold[1] != user_id:
+                return None
+            self._remove(date_id)
+            return hold
+
+    def restore(self, date_id, hold):
+        """
+        Put back a hold returned by claim, unless it has expired or the slot
+        has been held again in the meantime.
+        """
+        with self._lock:
+            now = time.time()
+            self._reclaim(now)
+            token, _, starts_at, expires_at = hold
+            if expires_at <= now or date_id in self._holds or self._conflicts(starts_at):
+                return
+            self._holds[date_id] = hold
+            self._by_date.setdefault(starts_at.date(), set()).add(date_id)
+            heapq.heappush(self._heap, (expires_at, date_id, token))
+
+    def held_ids(self):
+        """Return the set of available date IDs with an active hold."""
+        with self._lock:
+            self._reclaim(time.time())
+            return set(self._holds)
@@ -2,6 +2,8 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
+from hold_store import HoldStore
+from query_budget import QueryBudget
 
 # Initialize extensions for the Flask application
 
@@ -9,3 +11,5 @@ db = SQLAlchemy()  # SQLAlchemy instance for database management and ORM functio
 ma = Marshmallow()  # Marshmallow instance for object serialization and deserialization
 bcrypt = Bcrypt()  # Bcrypt instance for hashing passwords securely
 jwt = JWTManager()  # JWTManager instance for handling JSON Web Tokens for authentication
+hold_store = HoldStore()  # HoldStore instance for short-lived holds on available dates
+query_budget = QueryBudget()  # QueryBudget instance for enforcing per-route SQL statement budgets
@@ -0,0 +1,114 @@
+import time
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Raised when a request runs more SQL statements or spends more time in the
+    database than its route's budget allows while the app is in testing mode.
+    """
+
+
+class QueryBudget:
+    """
+    Flask extension enforcing a per-route budget of SQL statements and database time.
+
+    Statements are counted with SQLAlchemy's before_cursor_execute and
+    after_cursor_execute events. Budgets are declared on view functions with
+    the ``limit`` decorator and can be overridden per endpoint through the
+    QUERY_BUDGETS config map, for example ``{"main.get_users": {"statements": 1, "ms": 100}}``.
+
+    When a request exceeds its budget, QueryBudgetExceeded is raised in tests
+    (app.testing) so the regression fails the test, and otherwise a warning
+    with the statement log is written to the app logger. Budgets are checked
+    after the view has committed, so outside tests they only warn rather
+    than turn a saved write into an error response.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """
+        Register the request hooks and the SQLAlchemy cursor listeners.
+
+        Args:
+            app (Flask): The Flask application instance.
+        """
+        app.config.setdefault("QUERY_BUDGETS", {})
+        app.before_request(self._start_request)
+        app.after_request(self._check_request)
+
+        if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+    def limit(self, statements=None, ms=None):
+        """
+        Declare the budget for a view function.
+
+        Apply it below the route decorator so the registered view carries the budget.
+
+        Args:
+            statements (int): Maximum number of SQL statements per request.
+            ms (float): Maximum total database time per request in milliseconds.
+
+        Returns:
+            callable: Decorator returning the view function unchanged apart from its budget.
+        """
+        def decorator(view):
+            view.query_budget = {"statements": statements, "ms": ms}
+            return view
+        return decorator
+
+    def _start_request(self):
+        g.query_log = []
+
+    def _check_request(self, response):
+        query_log = g.pop("query_log", None)
+        budget = self._budget_for(request.endpoint)
+        if query_log is None or budget is None:
+            return response
+
+        statements = len(query_log)
+        elapsed_ms = sum(ms for _, ms in query_log)
+        problems = []
+        if budget.get("statements") is not None and statements > budget["statements"]:
+            problems.append(f"{statements} statements (budget {budget['statements']})")
+        if budget.get("ms") is not None and elapsed_ms > budget["ms"]:
+            problems.append(f"{elapsed_ms:.1f} ms in the database (budget {budget['ms']} ms)")
+        if not problems:
+            return response
+
+        message = "\n".join(
+            [f"{request.method} {request.path} ({request.endpoint}) exceeded its query budget: {', '.join(problems)}."]
+            + [f"  [{ms:.1f} ms] {statement}" for statement, ms in query_log]
+        )
+        if current_app.testing:
+            raise QueryBudgetExceeded(message)
+        current_app.logger.warning(message)
+        return response
+
+    def _budget_for(self, endpoint):
+        overrides = current_app.config["QUERY_BUDGETS"]
+        if endpoint in overrides:
+            return overrides[endpoint]
+        view = current_app.view_functions.get(endpoint)
+        return getattr(view, "query_budget", None)
+
+
+# The start time is kept on the execution context rather than the pooled
+# connection, so a statement that fails leaves nothing behind.
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and has_request_context() and "query_log" in g:
+        context._query_budget_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_query_budget_start", None)
+    if start is not None and has_request_context() and "query_log" in g:
+        g.query_log.append((statement, (time.perf_counter() - start) * 1000))
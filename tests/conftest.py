@@ -0,0 +1,49 @@
+import os
+from datetime import date, time
+
+import pytest
+
+# Set TEST_DATABASE_URL to a PostgreSQL database to run against the production backend
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "sqlite://")
+os.environ.setdefault("DATABASE_URL", TEST_DATABASE_URL)
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+
+from app import create_app
+from init import db, bcrypt, hold_store
+from models.user import User
+from models.employee import Employee
+from models.service import Service
+from models.available_date import AvailableDate
+
+
+@pytest.fixture
+def app():
+    """
+    Create the application against TEST_DATABASE_URL (in-memory SQLite by
+    default) in testing mode, seeded with one user, employee, service and open available date.
+    """
+    app = create_app()
+    app.config.update(TESTING=True, SQLALCHEMY_DATABASE_URI=TEST_DATABASE_URL, BCRYPT_LOG_ROUNDS=4)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([
+            User(name="User A", email="usera@email.com", mobile_number=9876543210,
+                 password=bcrypt.generate_password_hash("123456").decode("utf-8")),
+            Employee(name="Employee1"),
+            Service(service_type="Basic Grooming", price=50.00),
+            AvailableDate(date=date(2026, 1, 1), time=time(10, 0))
+        ])
+        db.session.commit()
+
+    yield app
+
+    with app.app_context():
+        db.drop_all()
+    hold_store.__init__()  # Forget holds taken during the test
+
+
+@pytest.fixture
+def client(app):
+    """Test client for the application."""
+    return app.test_client()
@@ -0,0 +1,91 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+import hold_store as hold_store_module
+from hold_store import HoldStore
+
+TEN_AM = datetime(2026, 1, 1, 10, 0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the store's clock with one the test moves forward by hand."""
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(hold_store_module, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def test_expired_holds_are_popped_from_the_heap(clock):
+    store = HoldStore()
+    store.hold(1, 1, TEN_AM, 60)
+    store.hold(2, 1, datetime(2026, 1, 1, 12, 0), 120)
+    store.hold(3, 1, datetime(2026, 1, 2, 10, 0), 30)
+
+    clock.now += 60
+    assert store.held_ids() == {2}
+    assert store._heap == [(1120.0, 2, store._holds[2][0])]
+    assert store._by_date == {TEN_AM.date(): {2}}
+
+    clock.now += 60
+    assert store.held_ids() == set()
+    assert store._heap == []
+
+
+def test_nearby_holds_are_rejected(clock):
+    store = HoldStore()
+    assert store.hold(1, 1, TEN_AM, 60)
+    assert store.hold(1, 2, TEN_AM, 60) is None
+    assert store.hold(2, 2, datetime(2026, 1, 1, 10, 30), 60) is None
+    assert store.hold(3, 2, datetime(2026, 1, 1, 11, 0), 60)
+    assert store.hold(4, 2, datetime(2026, 1, 2, 10, 30), 60)
+    assert store.conflicts(datetime(2026, 1, 1, 9, 30))
+    assert not store.conflicts(datetime(2026, 1, 1, 8, 0))
+
+
+def test_claim_checks_token_and_user(clock):
+    store = HoldStore()
+    token, _ = store.hold(1, 1, TEN_AM, 60)
+    assert store.claim(1, "wrong", 1) is None
+    assert store.claim(1, token, 2) is None
+    assert store.claim(1, token, 1) == (token, 1, TEN_AM, 1060.0)
+    assert store.held_ids() == set()
+
+    token, _ = store.hold(2, 1, TEN_AM, 60)
+    clock.now += 60
+    assert store.claim(2, token, 1) is None
+
+
+def test_restore_puts_back_a_claimed_hold(clock):
+    store = HoldStore()
+    token, _ = store.hold(1, 1, TEN_AM, 60)
+    store.restore(1, store.claim(1, token, 1))
+    assert store.held_ids() == {1}
+
+    # The restored hold keeps its original expiry
+    clock.now += 60
+    assert store.held_ids() == set()
+
+
+def test_restore_skips_expired_or_retaken_holds(clock):
+    store = HoldStore()
+    token, _ = store.hold(1, 1, TEN_AM, 60)
+    hold = store.claim(1, token, 1)
+    other_token, _ = store.hold(1, 2, TEN_AM, 60)
+    store.restore(1, hold)
+    assert store.claim(1, other_token, 2)
+
+    token, _ = store.hold(1, 1, TEN_AM, 60)
+    hold = store.claim(1, token, 1)
+    clock.now += 60
+    store.restore(1, hold)
+    assert store.held_ids() == set()
+
+
+def test_heap_is_compacted_after_claims(clock):
+    store = HoldStore()
+    for date_id in range(500):
+        token, _ = store.hold(date_id, 1, TEN_AM, 60)
+        store.claim(date_id, token, 1)
+    assert len(store._heap) <= 64
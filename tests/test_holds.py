@@ -0,0 +1,65 @@
+import pytest
+
+from init import db, hold_store
+from models.booking import Booking
+from models.available_date import AvailableDate
+
+BOOKING = {"user_id": 1, "service_id": 1, "employee_id": 1, "dog_breed": "Poodle", "dog_weight": 12.5}
+
+
+def take_hold(client, date_id=1, user_id=1):
+    response = client.post(f"/available_dates/{date_id}/hold", json={"user_id": user_id})
+    assert response.status_code == 201
+    return response.json["hold_token"]
+
+
+def count_bookings(app):
+    with app.app_context():
+        return db.session.scalar(db.select(db.func.count()).select_from(Booking))
+
+
+def test_held_date_is_hidden_from_listing(client):
+    take_hold(client)
+    assert client.get("/available_dates").json == []
+    assert client.post("/available_dates/1/hold", json={"user_id": 2}).status_code == 409
+
+
+def test_wrong_token_is_rejected(client):
+    take_hold(client)
+    response = client.post("/bookings", json={**BOOKING, "date_id": 1, "hold_token": "wrong"})
+    assert response.status_code == 409
+
+
+def test_expired_token_is_rejected(app, client):
+    app.config["SLOT_HOLD_SECONDS"] = 0
+    token = take_hold(client)
+    response = client.post("/bookings", json={**BOOKING, "date_id": 1, "hold_token": token})
+    assert response.status_code == 409
+    assert len(client.get("/available_dates").json) == 1
+
+
+def test_hold_is_kept_when_booking_fails(app, client, monkeypatch):
+    token = take_hold(client)
+
+    def fail_commit():
+        raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(db.session, "commit", fail_commit)
+    with pytest.raises(RuntimeError):
+        client.post("/bookings", json={**BOOKING, "date_id": 1, "hold_token": token})
+    monkeypatch.undo()
+
+    assert hold_store.held_ids() == {1}
+    assert client.post("/bookings", json={**BOOKING, "date_id": 1, "hold_token": token}).status_code == 201
+
+
+def test_hold_on_slot_booked_elsewhere_is_rejected(app, client):
+    token = take_hold(client)
+    with app.app_context():
+        db.session.get(AvailableDate, 1).is_booked = True
+        db.session.commit()
+
+    response = client.post("/bookings", json={**BOOKING, "date_id": 1, "hold_token": token})
+    assert response.status_code == 409
+    assert count_bookings(app) == 0
+    assert hold_store.held_ids() == set()
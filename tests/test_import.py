@@ -0,0 +1,113 @@
+import json
+
+from init import db, bcrypt
+from models.user import User
+from models.booking import Booking
+from models.available_date import AvailableDate
+
+
+def run_import(app, path, *args):
+    """Run flask db import on a file and return the CLI result."""
+    return app.test_cli_runner().invoke(args=["db", "import", str(path), "--workers", "1", *args])
+
+
+def read_errors(path):
+    with open(f"{path}.errors.jsonl", encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+
+def test_import_users_reports_duplicates(app, tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "name,email,mobile_number,password\n"
+        "User B,userb@email.com,111,secret1\n"
+        "User C,userb@email.com,222,secret2\n"
+        "User D,usera@email.com,333,secret3\n"
+        "User E,usere@email.com,9876543210,secret4\n"
+    )
+
+    result = run_import(app, path, "--kind", "users")
+
+    assert result.exit_code == 0, result.output
+    errors = read_errors(path)
+    assert [(error["row_number"], list(error["errors"])) for error in errors] == [
+        (2, ["email"]), (3, ["email"]), (4, ["mobile_number"])
+    ]
+    assert all("password" not in error["row"] for error in errors)
+    with app.app_context():
+        user = db.session.scalar(db.select(User).filter_by(email="userb@email.com"))
+        assert user.mobile_number == 111
+        assert bcrypt.check_password_hash(user.password, "secret1")
+
+
+def test_import_users_reports_invalid_rows(app, tmp_path):
+    path = tmp_path / "users.jsonl"
+    path.write_text("\n".join([
+        '{"email": "userb@email.com", "mobile_number": 111, "password": "secret"}',
+        '{"email": "userc@email.com", "mobile_number": 222, "password": ',
+        '{"email": "userd@email.com", "mobile_number": 333, "password": 123456}',
+        '{"email": ["usere@email.com"], "mobile_number": 444, "password": "secret"}',
+        '{"email": "notanemail", "mobile_number": 555, "password": "secret"}',
+        '{"name": "' + "x" * 101 + '", "email": "userf@email.com", "mobile_number": 666, "password": "secret"}',
+        '{"email": "userg@email.com", "mobile_number": 99999999999999999999, "password": "secret"}',
+    ]) + "\n")
+
+    result = run_import(app, path, "--kind", "users")
+
+    assert result.exit_code == 0, result.output
+    errors = read_errors(path)
+    assert [(error["row_number"], list(error["errors"])) for error in errors] == [
+        (2, ["row"]), (3, ["password"]), (4, ["email"]), (5, ["email"]), (6, ["name"]), (7, ["mobile_number"])
+    ]
+    with app.app_context():
+        assert db.session.scalar(db.select(db.func.count()).select_from(User)) == 2
+
+
+def test_import_bookings_rejects_conflicts(app, tmp_path):
+    path = tmp_path / "bookings.jsonl"
+    rows = [
+        {"email": "usera@email.com", "date": "2026-01-01", "time": "10:00:00", "service_id": 1, "employee_id": 1},
+        {"user_id": 1, "date": "2026-01-01", "time": "10:30:00", "service_id": 1, "employee_id": 1},
+        {"email": "nobody@email.com", "date": "2026-01-02", "time": "10:00:00", "service_id": 1, "employee_id": 1},
+        {"user_id": 1, "date": "2026-01-01", "time": "12:00:00", "service_id": 1, "employee_id": 1, "dog_weight": 8.5},
+    ]
+    path.write_text("".join(json.dumps(row) + "\n" for row in rows))
+
+    result = run_import(app, path, "--kind", "bookings")
+
+    assert result.exit_code == 0, result.output
+    errors = read_errors(path)
+    assert [(error["row_number"], list(error["errors"])) for error in errors] == [(2, ["time"]), (3, ["user_id"])]
+    with app.app_context():
+        assert db.session.scalar(db.select(db.func.count()).select_from(Booking)) == 2
+        assert db.session.get(AvailableDate, 1).is_booked
+
+
+def test_import_resumes_after_checkpoint(app, tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "name,email,mobile_number,password\n"
+        "User B,userb@email.com,111,secret\n"
+        "User C,userc@email.com,222,secret\n"
+    )
+    assert run_import(app, path, "--kind", "users", "--batch-size", "1").exit_code == 0
+
+    with open(path, "a") as file:
+        file.write("User D,userd@email.com,333,secret\n")
+    result = run_import(app, path, "--kind", "users", "--resume")
+
+    assert result.exit_code == 0, result.output
+    assert "Resuming after row 2." in result.output
+    assert read_errors(path) == []
+    with open(f"{path}.checkpoint", encoding="utf-8") as file:
+        assert json.load(file)["row"] == 3
+    with app.app_context():
+        assert db.session.scalar(db.select(db.func.count()).select_from(User)) == 4
+
+
+def test_import_rejects_invalid_options(app, tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text("name,email,mobile_number,password\n")
+
+    assert run_import(app, path, "--kind", "users", "--batch-size", "0").exit_code != 0
+    assert run_import(app, path, "--kind", "users", "--workers", "0").exit_code != 0
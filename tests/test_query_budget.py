@@ -0,0 +1,51 @@
+import pytest
+
+from query_budget import QueryBudgetExceeded
+
+BOOKING = {"user_id": 1, "service_id": 1, "employee_id": 1, "dog_breed": "Poodle", "dog_weight": 12.5}
+
+
+@pytest.mark.parametrize("path", ["/users", "/bookings", "/available_dates", "/employees", "/services"])
+def test_list_routes_within_budget(client, path):
+    assert client.get(path).status_code == 200
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/available_dates", {"date": "2026-01-02", "time": "09:00:00"}),
+    ("/employees", {"name": "Employee2"}),
+    ("/services", {"service_type": "Deluxe Grooming", "price": 75.00}),
+    ("/auth/register", {"name": "User B", "email": "userb@email.com", "mobile_number": 1234567890, "password": "123456"}),
+])
+def test_create_routes_within_budget(client, path, body):
+    assert client.post(path, json=body).status_code == 201
+
+
+def test_login_within_budget(client):
+    response = client.post("/auth/login", json={"email": "usera@email.com", "password": "wrong"})
+    assert response.status_code == 400
+
+
+def test_booking_within_budget(client):
+    response = client.post("/bookings", json={**BOOKING, "date": "2026-01-01", "time": "10:00:00"})
+    assert response.status_code == 201
+
+
+def test_hold_and_conversion_within_budget(client):
+    hold = client.post("/available_dates/1/hold", json={"user_id": 1})
+    assert hold.status_code == 201
+
+    response = client.post("/bookings", json={**BOOKING, "date_id": 1, "hold_token": hold.json["hold_token"]})
+    assert response.status_code == 201
+
+
+def test_route_over_budget_raises(app, client):
+    app.config["QUERY_BUDGETS"] = {"main.get_users": {"statements": 0}}
+    with pytest.raises(QueryBudgetExceeded, match="1 statements \\(budget 0\\)"):
+        client.get("/users")
+
+
+def test_route_over_budget_warns_outside_tests(app, client, caplog):
+    app.config.update(TESTING=False, QUERY_BUDGETS={"main.get_users": {"statements": 0}})
+    assert client.get("/users").status_code == 200
+    assert "exceeded its query budget" in caplog.text
+    assert "SELECT" in caplog.text